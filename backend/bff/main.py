@@ -1,39 +1,134 @@
 import asyncio
-
-from fastapi import FastAPI, Query, Path, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
+import hashlib
+from contextlib import asynccontextmanager
+from time import monotonic
+
+from async_lru import alru_cache
+from fastapi import FastAPI, Query, Path, HTTPException, Request
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import Response
 import httpx
+import orjson
+
+from middleware import FastCORS, TimingMiddleware
+
+SERVICES_URL = "http://localhost:8001"
+PATIENTS_CACHE_TTL = 10.0
+SEARCH_CACHE_TTL = 30
+SEARCH_CACHE_SIZE = 1024
+CLIENT_CACHE_CONTROL = "private, max-age=10"
+
+# (fetched_at, body, etag) of the last successful upstream /patients response
+_patients_cache: tuple[float, bytes, str] | None = None
+_patients_lock: asyncio.Lock | None = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _patients_cache, _patients_lock
+    _patients_cache = None
+    _patients_lock = asyncio.Lock()
+
+    # One pooled client for the app's lifetime so upstream connections are kept alive.
+    # HTTP/2 lets the get_patient fan-out share a single multiplexed connection.
+    async with httpx.AsyncClient(
+        base_url=SERVICES_URL,
+        http2=True,
+        timeout=5.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        # Services gzips large bodies; on the local hop that is only wasted CPU
+        # since responses are decoded here and re-encoded for the browser
+        headers={"Accept-Encoding": "identity"},
+    ) as client:
+        app.state.client = client
+        # Built per app run so cached entries and their TTL timers belong to this event loop
+        app.state.search_medications = alru_cache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)(
+            _fetch_medication_search
+        )
+        yield
 
-app = FastAPI(title="Livny Health BFF", version="0.1.0")
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173", "http://localhost:5174"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+app = FastAPI(
+    title="Livny Health BFF",
+    version="0.1.0",
+    lifespan=lifespan,
 )
 
-SERVICES_URL = "http://localhost:8001"
+# Added first so it sits inside CORS; preflights are answered before reaching it
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+app.add_middleware(FastCORS, origins=["http://localhost:5173", "http://localhost:5174"])
+# Outermost so the timing covers every other layer
+app.add_middleware(TimingMiddleware)
+
+
+def _etag(body: bytes) -> str:
+    # Weak: GZipMiddleware may send the same tag on a differently encoded body
+    return 'W/"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of etag against an If-None-Match list, which may be "*"."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def _conditional_json(request: Request, body: bytes, cache_control: str, etag: str | None = None) -> Response:
+    """Return body with an ETag, or an empty 304 if the client already has it."""
+    etag = etag or _etag(body)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _fresh_patients() -> tuple[float, bytes, str] | None:
+    if _patients_cache and monotonic() - _patients_cache[0] < PATIENTS_CACHE_TTL:
+        return _patients_cache
+    return None
 
 
 @app.get("/patients")
-async def get_patients():
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{SERVICES_URL}/patients")
-        return response.json()
+async def get_patients(request: Request):
+    global _patients_cache
+    cached = _fresh_patients()
+    if cached is None:
+        async with _patients_lock:
+            # Another request may have refilled the cache while we waited
+            cached = _fresh_patients()
+            if cached is None:
+                response = await app.state.client.get("/patients")
+                if response.status_code != 200:
+                    return Response(
+                        content=response.content, media_type="application/json", status_code=response.status_code
+                    )
+                cached = _patients_cache = (monotonic(), response.content, _etag(response.content))
+
+    _, body, etag = cached
+    return _conditional_json(request, body, CLIENT_CACHE_CONTROL, etag)
+
+
+async def _cancel_all(*tasks: asyncio.Task) -> None:
+    """Cancel tasks and wait for them, retrieving any exception they already raised."""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
 
 
 @app.get("/patients/{patient_id}")
-async def get_patient(patient_id: str = Path(..., description="The patient ID")):
-    async with httpx.AsyncClient() as client:
-        patient_task = client.get(f"{SERVICES_URL}/patients/{patient_id}")
-        allergies_task = client.get(f"{SERVICES_URL}/patients/{patient_id}/allergies")
-        medications_task = client.get(f"{SERVICES_URL}/patients/{patient_id}/medications")
-
-        patient_res, allergies_res, medications_res = await asyncio.gather(
-            patient_task, allergies_task, medications_task
-        )
+async def get_patient(request: Request, patient_id: str = Path(..., description="The patient ID")):
+    client = app.state.client
+    patient_task = asyncio.create_task(client.get(f"/patients/{patient_id}"))
+    allergies_task = asyncio.create_task(client.get(f"/patients/{patient_id}/allergies"))
+    medications_task = asyncio.create_task(client.get(f"/patients/{patient_id}/medications"))
+
+    try:
+        patient_res = await patient_task
 
         if patient_res.status_code == 404:
             raise HTTPException(status_code=404, detail="Patient not found")
@@ -41,22 +136,38 @@ async def get_patient(patient_id: str = Path(..., description="The patient ID"))
         if patient_res.status_code != 200:
             raise HTTPException(status_code=patient_res.status_code, detail="Error fetching patient data")
 
-        patient = patient_res.json()
-        patient["allergies"] = allergies_res.json()
-        patient["activeMedications"] = medications_res.json()
+        allergies_res, medications_res = await asyncio.gather(allergies_task, medications_task)
+    except BaseException:
+        # Free the connections held by the sub-resource fetches still running
+        await _cancel_all(patient_task, allergies_task, medications_task)
+        raise
+
+    patient = orjson.loads(patient_res.content)
+    patient["allergies"] = orjson.loads(allergies_res.content)
+    patient["activeMedications"] = orjson.loads(medications_res.content)
+
+    return _conditional_json(request, orjson.dumps(patient), CLIENT_CACHE_CONTROL)
+
 
-        return patient
+async def _fetch_medication_search(q_norm: str) -> tuple[bytes, str]:
+    """Fetch search results from services; raises on error so failures are not cached."""
+    response = await app.state.client.get("/medications/search", params={"q": q_norm})
+    response.raise_for_status()
+    return response.content, _etag(response.content)
 
 
 @app.get("/medications/search")
-async def search_medications(q: str = Query(..., min_length=3)):
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{SERVICES_URL}/medications/search", params={"q": q})
-        return response.json()
+async def search_medications(request: Request, q: str = Query(..., min_length=3)):
+    try:
+        # lower(), not casefold(): services searches on the lowered query, and
+        # casefold() would rewrite it (e.g. "straße" -> "strasse")
+        body, etag = await app.state.search_medications(q.lower())
+    except httpx.HTTPStatusError as e:
+        return Response(content=e.response.content, media_type="application/json", status_code=e.response.status_code)
+    return _conditional_json(request, body, CLIENT_CACHE_CONTROL, etag)
 
 
 @app.get("/medications/defaults")
 async def get_medication_defaults(name: str = Query(..., description="The medication name")):
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{SERVICES_URL}/medications/defaults", params={"name": name})
-        return response.json()
+    response = await app.state.client.get("/medications/defaults", params={"name": name})
+    return Response(content=response.content, media_type="application/json", status_code=response.status_code)
@@ -0,0 +1,133 @@
+"""
+Pure ASGI middleware for the BFF.
+
+These wrap the raw ASGI callable and mutate header lists in place rather than
+building Request/Response objects per call. Add new cross-cutting concerns
+(timing, logging, tracing) by subclassing PureASGIMiddleware, not with
+@app.middleware("http") or BaseHTTPMiddleware, which buffer every response.
+"""
+from time import perf_counter
+
+ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+PREFLIGHT_MAX_AGE = b"600"
+
+
+class PureASGIMiddleware:
+    """Base for HTTP middleware that observes requests and edits response headers.
+
+    Subclasses override on_request, whose return value is passed back as state,
+    and on_response_start, which may mutate message["headers"] in place.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = self.on_request(scope)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                self.on_response_start(scope, message, state)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def on_request(self, scope):
+        return None
+
+    def on_response_start(self, scope, message, state) -> None:
+        pass
+
+
+class TimingMiddleware(PureASGIMiddleware):
+    """Adds an x-response-time header with the time taken to start the response."""
+
+    def on_request(self, scope) -> float:
+        return perf_counter()
+
+    def on_response_start(self, scope, message, started: float) -> None:
+        elapsed_ms = (perf_counter() - started) * 1000
+        message.setdefault("headers", []).append((b"x-response-time", f"{elapsed_ms:.2f}ms".encode()))
+
+
+class FastCORS:
+    """CORS for a fixed origin allowlist with credentials and wildcard methods/headers.
+
+    Equivalent to CORSMiddleware(allow_origins=origins, allow_credentials=True,
+    allow_methods=["*"], allow_headers=["*"]) with the header values built once.
+    """
+
+    def __init__(self, app, origins: list[str]):
+        self.app = app
+        self.origins = frozenset(o.encode("latin-1") for o in origins)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight(origin, request_headers, send)
+            return
+
+        if origin not in self.origins:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = message.setdefault("headers", [])
+                headers.append((b"access-control-allow-origin", origin))
+                headers.append((b"access-control-allow-credentials", b"true"))
+                headers.append((b"vary", b"Origin"))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _preflight(self, origin: bytes, request_headers: bytes | None, send):
+        if origin not in self.origins:
+            body = b"Disallowed CORS origin"
+            await send({
+                "type": "http.response.start",
+                "status": 400,
+                "headers": [
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"vary", b"Origin"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        headers = [
+            (b"access-control-allow-origin", origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"access-control-allow-methods", ALLOW_METHODS),
+            (b"access-control-max-age", PREFLIGHT_MAX_AGE),
+            (b"vary", b"Origin"),
+            (b"content-length", b"0"),
+        ]
+        # Wildcard headers with credentials means echoing back what was requested
+        if request_headers:
+            headers.append((b"access-control-allow-headers", request_headers))
+        await send({"type": "http.response.start", "status": 204, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
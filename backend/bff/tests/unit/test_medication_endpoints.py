@@ -0,0 +1,114 @@
+"""
+Unit tests for medication-related endpoints.
+
+These tests verify the BFF passes services layer responses
+through unchanged.
+"""
+from fastapi import status
+from httpx import Response
+import pytest
+import respx
+
+from main import SERVICES_URL
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestSearchMedications:
+    """Tests for GET /medications/search endpoint"""
+
+    async def test_search_medications_returns_200(self, client, mock_services):
+        """Should return 200 OK for valid search"""
+        response = await client.get("/medications/search?q=amox")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/json"
+
+    async def test_search_medications_passes_through_results(self, client, mock_services):
+        """Should return the services layer results unchanged"""
+        response = await client.get("/medications/search?q=amox")
+        medications = response.json()
+
+        assert len(medications) == 1
+        assert medications[0]["name"] == "Amoxicillin 500 MG Oral Capsule"
+        assert medications[0]["commonDosing"] == ["500mg TID", "500mg BID"]
+
+    async def test_search_medications_no_results(self, client, mock_services):
+        """Should return empty list when services finds no matches"""
+        response = await client.get("/medications/search?q=zzzz")
+        assert response.json() == []
+
+    async def test_search_medications_served_from_cache(self, client, mock_services):
+        """Repeat searches differing only by case should hit the services layer once"""
+        response1 = await client.get("/medications/search?q=amox")
+        response2 = await client.get("/medications/search?q=AMOX")
+
+        assert response1.json() == response2.json()
+        assert respx.calls.call_count == 1
+
+    async def test_search_medications_keeps_query_text(self, client, mock_services):
+        """Should send the lowercased query upstream without case-folding it"""
+        route = respx.get(f"{SERVICES_URL}/medications/search").mock(return_value=Response(200, json=[]))
+        await client.get("/medications/search", params={"q": "Straße"})
+
+        assert route.calls.last.request.url.params["q"] == "straße"
+
+    async def test_search_medications_upstream_error_not_cached(self, client, mock_services):
+        """Upstream errors should be passed through and not cached"""
+        route = respx.get(f"{SERVICES_URL}/medications/search", params={"q": "fail"}).mock(
+            return_value=Response(502, json={"detail": "RxNorm unavailable"})
+        )
+        response1 = await client.get("/medications/search?q=fail")
+        response2 = await client.get("/medications/search?q=fail")
+
+        assert response1.status_code == status.HTTP_502_BAD_GATEWAY
+        assert response2.json() == {"detail": "RxNorm unavailable"}
+        assert route.call_count == 2
+
+    async def test_search_medications_not_modified(self, client, mock_services):
+        """Should return 304 when If-None-Match matches the results"""
+        etag = (await client.get("/medications/search?q=amox")).headers["etag"]
+        response = await client.get("/medications/search?q=amox", headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    async def test_search_medications_large_results_gzipped(self, client, mock_services):
+        """Should gzip responses of 1KB or more when the client accepts it"""
+        medications = [
+            {"id": str(i), "name": f"Amoxicillin {i} MG Oral Capsule", "commonDosing": ["500mg TID"]}
+            for i in range(50)
+        ]
+        respx.get(f"{SERVICES_URL}/medications/search", params={"q": "amoxicillin"}).mock(
+            return_value=Response(200, json=medications)
+        )
+        response = await client.get("/medications/search?q=amoxicillin", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == medications
+
+    async def test_search_medications_small_results_not_gzipped(self, client, mock_services):
+        """Should leave responses under 1KB uncompressed"""
+        response = await client.get("/medications/search?q=amox", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+    async def test_search_medications_query_too_short(self, client, mock_services):
+        """Should return 422 when query is less than 3 characters"""
+        response = await client.get("/medications/search?q=ab")
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestGetMedicationDefaults:
+    """Tests for GET /medications/defaults endpoint"""
+
+    async def test_get_medication_defaults(self, client, mock_services):
+        """Should return the services layer defaults unchanged"""
+        response = await client.get("/medications/defaults?name=Amoxicillin")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"defaultDuration": 10}
+
+    async def test_get_medication_defaults_missing_name(self, client, mock_services):
+        """Should return 422 when name parameter is missing"""
+        response = await client.get("/medications/defaults")
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
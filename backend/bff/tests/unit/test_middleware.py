@@ -0,0 +1,88 @@
+"""
+Unit tests for the BFF's pure ASGI middleware.
+
+These verify response timing headers, and CORS headers on simple and
+preflight requests for allowed and disallowed origins.
+"""
+from fastapi import status
+import pytest
+
+ALLOWED_ORIGIN = "http://localhost:5173"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestSimpleRequests:
+    """Tests for CORS headers on regular requests"""
+
+    async def test_allowed_origin_gets_cors_headers(self, client, mock_services):
+        """Should echo the origin and allow credentials"""
+        response = await client.get("/patients", headers={"Origin": ALLOWED_ORIGIN})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["access-control-allow-origin"] == ALLOWED_ORIGIN
+        assert response.headers["access-control-allow-credentials"] == "true"
+        assert response.headers["vary"] == "Origin"
+
+    async def test_disallowed_origin_gets_no_cors_headers(self, client, mock_services):
+        """Should not add CORS headers for unknown origins"""
+        response = await client.get("/patients", headers={"Origin": "http://evil.example"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "access-control-allow-origin" not in response.headers
+
+    async def test_no_origin_gets_no_cors_headers(self, client, mock_services):
+        """Same-origin requests should pass through untouched"""
+        response = await client.get("/patients")
+
+        assert "access-control-allow-origin" not in response.headers
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestPreflightRequests:
+    """Tests for OPTIONS preflight handling"""
+
+    async def test_preflight_allowed_origin(self, client):
+        """Should answer preflight without reaching the app"""
+        response = await client.options("/patients", headers={
+            "Origin": ALLOWED_ORIGIN,
+            "Access-Control-Request-Method": "GET",
+            "Access-Control-Request-Headers": "content-type,authorization",
+        })
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert response.headers["access-control-allow-origin"] == ALLOWED_ORIGIN
+        assert response.headers["access-control-allow-credentials"] == "true"
+        assert "GET" in response.headers["access-control-allow-methods"]
+        assert response.headers["access-control-allow-headers"] == "content-type,authorization"
+
+    async def test_preflight_disallowed_origin(self, client):
+        """Should reject preflight from unknown origins"""
+        response = await client.options("/patients", headers={
+            "Origin": "http://evil.example",
+            "Access-Control-Request-Method": "GET",
+        })
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "access-control-allow-origin" not in response.headers
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestTimingMiddleware:
+    """Tests for the x-response-time header"""
+
+    async def test_response_time_header(self, client, mock_services):
+        """Should report how long the response took in milliseconds"""
+        response = await client.get("/patients")
+
+        assert response.headers["x-response-time"].endswith("ms")
+        assert float(response.headers["x-response-time"][:-2]) >= 0
+
+    async def test_response_time_header_on_errors(self, client, mock_services):
+        """Should also time error responses"""
+        response = await client.get("/patients/unknown-id")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert "x-response-time" in response.headers
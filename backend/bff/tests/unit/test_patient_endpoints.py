@@ -4,32 +4,37 @@ Unit tests for patient-related endpoints.
 These tests verify the API contract and response structure
 without needing a real database.
 """
+import asyncio
+
 from fastapi import status
 from httpx import Response
 import pytest
 import respx
 
+from main import SERVICES_URL
+
 
 @pytest.mark.unit
+@pytest.mark.asyncio
 class TestGetPatients:
     """Tests for GET /patients endpoint"""
     
-    def test_get_patients_returns_200(self, client, mock_services):
+    async def test_get_patients_returns_200(self, client, mock_services):
         """Should return 200 OK status"""
-        response = client.get("/patients")
+        response = await client.get("/patients")
         assert response.status_code == status.HTTP_200_OK
     
-    def test_get_patients_returns_list(self, client, mock_services):
+    async def test_get_patients_returns_list(self, client, mock_services):
         """Should return a list of patients"""
-        response = client.get("/patients")
+        response = await client.get("/patients")
         data = response.json()
         
         assert isinstance(data, list)
         assert len(data) > 0
     
-    def test_get_patients_structure(self, client, mock_services):
+    async def test_get_patients_structure(self, client, mock_services):
         """Each patient should have required fields"""
-        response = client.get("/patients")
+        response = await client.get("/patients")
         patients = response.json()
         
         # Check first patient has expected structure
@@ -39,9 +44,9 @@ class TestGetPatients:
         assert "dateOfBirth" in first_patient
         assert "mrn" in first_patient
     
-    def test_get_patients_data_types(self, client, mock_services):
+    async def test_get_patients_data_types(self, client, mock_services):
         """Patient fields should have correct types"""
-        response = client.get("/patients")
+        response = await client.get("/patients")
         first_patient = response.json()[0]
         
         assert isinstance(first_patient["id"], str)
@@ -49,26 +54,82 @@ class TestGetPatients:
         assert isinstance(first_patient["dateOfBirth"], str)
         assert isinstance(first_patient["mrn"], str)
     
-    def test_get_patients_consistent_data(self, client, mock_services):
+    async def test_get_patients_consistent_data(self, client, mock_services):
         """Multiple calls should return same data (since using fake data)"""
-        response1 = client.get("/patients")
-        response2 = client.get("/patients")
+        response1 = await client.get("/patients")
+        response2 = await client.get("/patients")
         
         assert response1.json() == response2.json()
 
+    async def test_get_patients_served_from_cache(self, client, mock_services):
+        """Repeat calls within the TTL should not hit the services layer again"""
+        route = respx.get(f"{SERVICES_URL}/patients")
+        await client.get("/patients")
+        await client.get("/patients")
+
+        assert route.call_count == 1
+
+    async def test_get_patients_upstream_error_not_cached(self, client, mock_services):
+        """Upstream errors should be passed through and not cached"""
+        route = respx.get(f"{SERVICES_URL}/patients").mock(return_value=Response(503))
+        response1 = await client.get("/patients")
+        response2 = await client.get("/patients")
+
+        assert response1.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response2.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert route.call_count == 2
+
+    async def test_get_patients_returns_etag(self, client, mock_services):
+        """Should return a weak ETag and short private cache lifetime"""
+        response = await client.get("/patients")
+
+        assert response.headers["etag"].startswith('W/"')
+        assert response.headers["cache-control"] == "private, max-age=10"
+
+    async def test_get_patients_not_modified(self, client, mock_services):
+        """Should return 304 with no body when If-None-Match matches"""
+        etag = (await client.get("/patients")).headers["etag"]
+        response = await client.get("/patients", headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    @pytest.mark.parametrize("if_none_match", [
+        pytest.param("{etag}", id="weak"),
+        pytest.param("{opaque}", id="strong_form"),
+        pytest.param('"stale", {etag}', id="list"),
+        pytest.param("*", id="any"),
+    ])
+    async def test_get_patients_not_modified_forms(self, client, mock_services, if_none_match):
+        """Should compare If-None-Match weakly, as a list that may be *"""
+        etag = (await client.get("/patients")).headers["etag"]
+        header = if_none_match.format(etag=etag, opaque=etag.removeprefix("W/"))
+        response = await client.get("/patients", headers={"If-None-Match": header})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    async def test_get_patients_stale_etag(self, client, mock_services):
+        """Should return the full body when If-None-Match does not match"""
+        response = await client.get("/patients", headers={"If-None-Match": '"stale"'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) > 0
+
 
 @pytest.mark.unit
+@pytest.mark.asyncio
 class TestGetPatientById:
     """Tests for GET /patients/{patient_id} endpoint"""
     
-    def test_get_patient_by_id_returns_200(self, client, mock_services):
+    async def test_get_patient_by_id_returns_200(self, client, mock_services):
         """Should return 200 OK status for valid patient ID"""
-        response = client.get("/patients/patient-001")
+        response = await client.get("/patients/patient-001")
         assert response.status_code == status.HTTP_200_OK
     
-    def test_get_patient_by_id_structure(self, client, mock_services):
+    async def test_get_patient_by_id_structure(self, client, mock_services):
         """Patient should have required fields"""
-        response = client.get("/patients/patient-001")
+        response = await client.get("/patients/patient-001")
         patient = response.json()
         
         assert "id" in patient
@@ -76,9 +137,9 @@ class TestGetPatientById:
         assert "dateOfBirth" in patient
         assert "mrn" in patient
     
-    def test_get_patient_by_id_data_types(self, client, mock_services):
+    async def test_get_patient_by_id_data_types(self, client, mock_services):
         """Patient fields should have correct types"""
-        response = client.get("/patients/patient-001")
+        response = await client.get("/patients/patient-001")
         patient = response.json()
         
         assert isinstance(patient["id"], str)
@@ -86,13 +147,47 @@ class TestGetPatientById:
         assert isinstance(patient["dateOfBirth"], str)
         assert isinstance(patient["mrn"], str)
     
-    def test_get_patient_by_id_not_found(self, client, mock_services):
+    async def test_get_patient_by_id_merges_subresources(self, client, mock_services):
+        """Should merge allergies and active medications into the patient"""
+        patient = (await client.get("/patients/patient-001")).json()
+
+        assert patient["allergies"][0]["allergen"] == "Penicillin"
+        assert patient["activeMedications"][0]["name"] == "Lisinopril"
+
+    async def test_get_patient_by_id_not_modified(self, client, mock_services):
+        """Should return 304 when If-None-Match matches the merged patient"""
+        etag = (await client.get("/patients/patient-001")).headers["etag"]
+        response = await client.get("/patients/patient-001", headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    async def test_get_patient_by_id_not_found(self, client, mock_services):
         """Should return 404 Not Found for invalid patient ID"""
-        response = client.get("/patients/unknown-id")
+        response = await client.get("/patients/unknown-id")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_get_patient_by_id_not_found_cancels_subresources(self, client, mock_services):
+        """Should return 404 without waiting for slow allergy and medication fetches"""
+        cancelled = []
+
+        async def slow(request):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(request.url.path)
+                raise
+            return Response(200, json=[])
+
+        respx.get(f"{SERVICES_URL}/patients/unknown-id/allergies").mock(side_effect=slow)
+        respx.get(f"{SERVICES_URL}/patients/unknown-id/medications").mock(side_effect=slow)
+
+        response = await asyncio.wait_for(client.get("/patients/unknown-id"), timeout=1)
+
         assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert sorted(cancelled) == ["/patients/unknown-id/allergies", "/patients/unknown-id/medications"]
 
-    def test_get_patient_by_id_invalid_format(self, client, mock_services):
+    async def test_get_patient_by_id_invalid_format(self, client, mock_services):
         """Should return 422 Unprocessable Entity for invalid ID format"""
-        response = client.get("/patients/invalid-id-format")
+        response = await client.get("/patients/invalid-id-format")
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
 
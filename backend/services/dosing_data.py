@@ -4,6 +4,7 @@ Maps medication names to typical dosing regimens.
 """
 
 import re
+from functools import lru_cache
 
 # Dosing patterns keyed by generic drug name (lowercase)
 # Each entry maps strength patterns to common dosing options
@@ -221,6 +222,18 @@ COMMON_DOSING_PATTERNS: dict[str, dict[str, list[str]]] = {
 }
 
 
+# Per-name results are memoized; RxNorm concept names repeat across searches
+DOSING_CACHE_SIZE = 2048
+
+# Precomputed at import so per-call work is just the scan
+_STRENGTH_RE = re.compile(r"(\d+(?:\.\d+)?)(?:/\d+)?[\s-]*(?:MG|MCG|MG/ML)\b", re.IGNORECASE)
+# Longest keys first so that, at the leftmost match position, the most
+# specific drug name wins (e.g. "amoxicillin/clavulanate" over "amoxicillin")
+_DRUG_RE = re.compile(
+    "|".join(re.escape(drug) for drug in sorted(COMMON_DOSING_PATTERNS, key=len, reverse=True))
+)
+
+
 def _extract_strength_value(medication_name: str) -> str | None:
     """Extract the numeric strength value from a medication name.
 
@@ -232,7 +245,7 @@ def _extract_strength_value(medication_name: str) -> str | None:
     """
     # Handle commas in numbers by removing them first
     name_normalized = medication_name.replace(",", "")
-    match = re.search(r"(\d+(?:\.\d+)?)(?:/\d+)?[\s-]*(?:MG|MCG|MG/ML)\b", name_normalized, re.IGNORECASE)
+    match = _STRENGTH_RE.search(name_normalized)
     if match:
         return match.group(1)
     return None
@@ -248,18 +261,8 @@ def _find_matching_drug(medication_name: str) -> str | None:
     # Normalize common separators to match our keys
     name_normalized = name_lower.replace("-", "/")
 
-    matches = []
-    for drug in COMMON_DOSING_PATTERNS:
-        pos = name_normalized.find(drug)
-        if pos != -1:
-            matches.append((pos, len(drug), drug))
-
-    if not matches:
-        return None
-
-    # Sort by position (earliest first), then by length descending (longest first)
-    matches.sort(key=lambda x: (x[0], -x[1]))
-    return matches[0][2]
+    match = _DRUG_RE.search(name_normalized)
+    return match.group(0) if match else None
 
 
 def get_common_dosing(medication_name: str) -> list[str]:
@@ -272,19 +275,25 @@ def get_common_dosing(medication_name: str) -> list[str]:
     Returns:
         List of common dosing patterns, or empty list if not found
     """
+    # A fresh list per call, so callers can't mutate the cached result
+    return list(_common_dosing(medication_name))
+
+
+@lru_cache(maxsize=DOSING_CACHE_SIZE)
+def _common_dosing(medication_name: str) -> tuple[str, ...]:
     drug = _find_matching_drug(medication_name)
     if not drug:
-        return []
+        return ()
 
     dosing_options = COMMON_DOSING_PATTERNS[drug]
 
     # Try to match by strength first
     strength = _extract_strength_value(medication_name)
     if strength and strength in dosing_options:
-        return dosing_options[strength]
+        return tuple(dosing_options[strength])
 
     # Fall back to default dosing
-    return dosing_options.get("_default", [])
+    return tuple(dosing_options.get("_default", ()))
 
 
 # Medication categories for default duration
@@ -311,6 +320,17 @@ PRN_MEDICATIONS = {
     "tramadol",
 }
 
+# Chronic medications: 30 days default
+DEFAULT_DURATION_DAYS = 30
+
+# Merged at import; later entries win, so antibiotics take precedence over
+# steroids over PRN if a drug is ever listed in more than one category
+_DURATION_BY_DRUG: dict[str, int] = (
+    {drug: 30 for drug in PRN_MEDICATIONS}
+    | {drug: 7 for drug in SHORT_TERM_STEROIDS}
+    | {drug: 10 for drug in ANTIBIOTICS}
+)
+
 
 def get_default_duration(medication_name: str) -> int:
     """
@@ -326,15 +346,4 @@ def get_default_duration(medication_name: str) -> int:
         Default duration in days
     """
     drug = _find_matching_drug(medication_name)
-
-    if drug in ANTIBIOTICS:
-        return 10
-
-    if drug in SHORT_TERM_STEROIDS:
-        return 7
-
-    if drug in PRN_MEDICATIONS:
-        return 30
-
-    # Chronic medications: 30 days default
-    return 30
+    return _DURATION_BY_DRUG.get(drug, DEFAULT_DURATION_DAYS)
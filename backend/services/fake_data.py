@@ -1,3 +1,5 @@
+import orjson
+
 
 FAKE_MEDICATIONS = [
     {"id": "amox-250", "name": "Amoxicillin 250mg capsule", "strength": "250mg", "form": "capsule", "commonDosing": ["250mg TID", "250mg BID"], "isControlled": False},
@@ -161,4 +163,12 @@ FAKE_PATIENTS = [
     },
 ]
 
+# Demographic fields served by the patient list and detail endpoints
+PATIENT_SUMMARY_FIELDS = ("id", "name", "dateOfBirth", "mrn")
 
+# Pre-serialized response bodies; the fake data is static, so endpoints can
+# return these bytes without building or encoding anything per request
+FAKE_PATIENTS_JSON = orjson.dumps([{k: p[k] for k in PATIENT_SUMMARY_FIELDS} for p in FAKE_PATIENTS])
+FAKE_PATIENT_BY_ID_JSON = {p["id"]: orjson.dumps({k: p[k] for k in PATIENT_SUMMARY_FIELDS}) for p in FAKE_PATIENTS}
+FAKE_ALLERGIES_JSON = {p["id"]: orjson.dumps(p.get("allergies", [])) for p in FAKE_PATIENTS}
+FAKE_MEDS_JSON = {p["id"]: orjson.dumps(p.get("activeMedications", [])) for p in FAKE_PATIENTS}
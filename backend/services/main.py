@@ -1,73 +1,116 @@
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import hashlib
+from typing import Annotated
+
+from fastapi import FastAPI, HTTPException, Query, Path, Request
+from fastapi.responses import JSONResponse, Response
+from starlette.middleware.gzip import GZipMiddleware
+import orjson
+from pydantic import StringConstraints
+
+from fake_data import FAKE_ALLERGIES_JSON, FAKE_MEDS_JSON, FAKE_PATIENT_BY_ID_JSON, FAKE_PATIENTS_JSON
+from rxnorm import rxnorm_client, search_medications as rxnorm_search
+from dosing_data import get_default_duration
 
-from fastapi import FastAPI, HTTPException, Query, Path
+SEARCH_CACHE_CONTROL = "public, max-age=60"
+PATIENTS_CACHE_CONTROL = "private, max-age=60"
+DEFAULTS_CACHE_CONTROL = "public, max-age=60"
 
-from fake_data import FAKE_PATIENTS
-from rxnorm import search_medications as rxnorm_search
-from dosing_data import get_default_duration
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with rxnorm_client():
+        yield
+
+
+app = FastAPI(
+    title="Livny Health Services",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+
+def _etag(body: bytes) -> str:
+    # Weak: GZipMiddleware may send the same tag on a differently encoded body
+    return 'W/"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
 
 
-app = FastAPI(title="Livny Health Services", version="0.1.0")
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of etag against an If-None-Match list, which may be "*"."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return True
+    return False
 
 
-def find_patient(patient_id: str):
-    for patient in FAKE_PATIENTS:
-        if patient["id"] == patient_id:
-            return patient
-    return None
+def _conditional_json(request: Request, body: bytes, cache_control: str, etag: str | None = None) -> Response:
+    """Return body with an ETag, or an empty 304 if the client already has it."""
+    etag = etag or _etag(body)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Fake data is fixed for the life of the process, so its ETag is too
+PATIENTS_ETAG = _etag(FAKE_PATIENTS_JSON)
+
+
+def _patient_json(index: dict[str, bytes], patient_id: str) -> Response:
+    body = index.get(patient_id)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Patient not found")
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/patients")
-async def get_patients():
-    return [
-        {
-            "id": p["id"],
-            "name": p["name"],
-            "dateOfBirth": p["dateOfBirth"],
-            "mrn": p["mrn"],
-        }
-        for p in FAKE_PATIENTS
-    ]
+async def get_patients(request: Request):
+    return _conditional_json(request, FAKE_PATIENTS_JSON, PATIENTS_CACHE_CONTROL, PATIENTS_ETAG)
 
 
 @app.get("/patients/{patient_id}")
 async def get_patient(patient_id: str = Path(..., description="The patient ID")):
-    patient = find_patient(patient_id)
-    if not patient:
-        raise HTTPException(status_code=404, detail="Patient not found")
-    return {
-        "id": patient["id"],
-        "name": patient["name"],
-        "dateOfBirth": patient["dateOfBirth"],
-        "mrn": patient["mrn"],
-    }
+    return _patient_json(FAKE_PATIENT_BY_ID_JSON, patient_id)
 
 
 @app.get("/patients/{patient_id}/allergies")
 async def get_patient_allergies(patient_id: str = Path(..., description="The patient ID")):
-    patient = find_patient(patient_id)
-    if not patient:
-        raise HTTPException(status_code=404, detail="Patient not found")
-    return patient.get("allergies", [])
+    return _patient_json(FAKE_ALLERGIES_JSON, patient_id)
 
 
 @app.get("/patients/{patient_id}/medications")
 async def get_patient_medications(patient_id: str = Path(..., description="The patient ID")):
-    patient = find_patient(patient_id)
-    if not patient:
-        raise HTTPException(status_code=404, detail="Patient not found")
-    return patient.get("activeMedications", [])
+    return _patient_json(FAKE_MEDS_JSON, patient_id)
+
+
+@app.get("/medications/search", response_model=None)
+async def search_medications(q: Annotated[str, StringConstraints(strip_whitespace=True, min_length=3), Query()]):
+    # Stripped before the length check, so whitespace padding can't satisfy min_length
+    return ORJSONResponse(await rxnorm_search(q), headers={"Cache-Control": SEARCH_CACHE_CONTROL})
 
 
-@app.get("/medications/search")
-async def search_medications(q: str = Query(..., min_length=3)):
-    query = q.strip()
-    if len(query) < 3:
-        raise HTTPException(status_code=400, detail="Query must be at least 3 characters")
-    return await rxnorm_search(query)
+@lru_cache(maxsize=1024)
+def _medication_defaults_json(name: str) -> tuple[bytes, str]:
+    body = orjson.dumps({"defaultDuration": get_default_duration(name)})
+    return body, _etag(body)
 
 
 @app.get("/medications/defaults")
-async def get_medication_defaults(name: str = Query(..., description="The medication name")):
+async def get_medication_defaults(request: Request, name: str = Query(..., description="The medication name")):
     """Get default prescription values for a medication."""
-    default_duration = get_default_duration(name)
-    return {"defaultDuration": default_duration}
+    body, etag = _medication_defaults_json(name)
+    return _conditional_json(request, body, DEFAULTS_CACHE_CONTROL, etag)
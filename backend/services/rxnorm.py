@@ -1,10 +1,21 @@
 import re
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
 
+from async_lru import alru_cache
 import httpx
+import orjson
 
 from dosing_data import get_common_dosing
 
 RXNORM_BASE_URL = "https://rxnav.nlm.nih.gov/REST"
+SEARCH_CACHE_TTL = 60
+SEARCH_CACHE_SIZE = 1024
+
+# Shared keep-alive client and its result cache, set while rxnorm_client() is
+# entered (the app lifespan)
+_client: httpx.AsyncClient | None = None
+_cached_search: Callable[[str], Awaitable[list[dict]]] | None = None
 
 FORM_PATTERNS = {
     "Oral Tablet": "tablet",
@@ -19,61 +30,107 @@ FORM_PATTERNS = {
     "Metered Dose Inhaler": "inhaler",
     "Inhalation Powder": "inhaler",
 }
+_FORM_BY_PATTERN = {pattern.upper(): form for pattern, form in FORM_PATTERNS.items()}
+
+# Strength and dosage form in one left-to-right pass over the name. Matched on
+# the name itself, not an uppercased copy: str.upper() can change the length
+# (e.g. "ß" -> "SS"). Form patterns go longest first so the most specific one
+# wins at a position; neither alternative can match inside the other.
+_NAME_RE = re.compile(
+    r"(?P<strength>\d+(?:\.\d+)?(?:/\d+(?:\.\d+)?)?\s*(?:MG|MCG|MG/ML|UNITS?|%|MEQ))"
+    r"|(?P<form>"
+    + "|".join(re.escape(pattern) for pattern in sorted(_FORM_BY_PATTERN, key=len, reverse=True))
+    + ")",
+    re.IGNORECASE,
+)
+
+
+@asynccontextmanager
+async def rxnorm_client():
+    """Open the shared RxNorm client so searches reuse TLS connections."""
+    global _client, _cached_search
+    # Restored on exit so nested use (e.g. tests inside a running app) is safe
+    previous = _client, _cached_search
+    async with httpx.AsyncClient(
+        base_url=RXNORM_BASE_URL,
+        http2=True,
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+    ) as client:
+        _client = client
+        # Built per client so cached entries and their TTL timers belong to this event loop
+        _cached_search = alru_cache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)(_search_rxnorm)
+        try:
+            yield client
+        finally:
+            _client, _cached_search = previous
 
 
 async def search_medications(query: str) -> list[dict]:
     """
     Search RxNorm for medications matching the query.
     Returns medications in frontend-compatible format.
+
+    RxNorm name search is case-insensitive, so results are cached per
+    normalized query; concurrent identical misses share one request.
+
+    Must be called inside rxnorm_client(), which opens the shared client.
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{RXNORM_BASE_URL}/drugs.json",
-            params={"name": query},
-            timeout=10.0,
-        )
-        response.raise_for_status()
-        data = response.json()
+    if _cached_search is None:
+        raise RuntimeError("RxNorm client is not open; enter rxnorm_client() first")
+    medications = await _cached_search(query.strip().lower())
+    # Fresh dicts and lists per call, so callers can't mutate the cached result
+    return [{**medication, "commonDosing": list(medication["commonDosing"])} for medication in medications]
+
+
+async def _search_rxnorm(query: str) -> list[dict]:
+    response = await _client.get("/drugs.json", params={"name": query})
+    response.raise_for_status()
+    data = orjson.loads(response.content)
 
     return _parse_drug_response(data)
 
 
 def _parse_drug_response(data: dict) -> list[dict]:
     """Parse RxNorm getDrugs response into medication list."""
-    medications = []
-    drug_group = data.get("drugGroup", {})
-    concept_groups = drug_group.get("conceptGroup", [])
-
-    for group in concept_groups:
-        tty = group.get("tty", "")
+    concept_groups = data.get("drugGroup", {}).get("conceptGroup") or ()
+    return [
+        _to_medication(concept)
+        for group in concept_groups
         # Only include clinical drugs (SCD) and branded drugs (SBD)
-        if tty not in ("SCD", "SBD"):
-            continue
-
-        for concept in group.get("conceptProperties", []):
-            name = concept.get("name", "")
-            medications.append({
-                "id": concept.get("rxcui", ""),
-                "name": name,
-                "strength": _extract_strength(name),
-                "form": _extract_form(name),
-                "commonDosing": get_common_dosing(name),
-                "isControlled": False,
-            })
-
-    return medications
-
-
-def _extract_strength(name: str) -> str:
-    """Extract strength from RxNorm drug name (e.g., '500 MG' from 'Amoxicillin 500 MG Oral Tablet')."""
-    match = re.search(r"(\d+(?:\.\d+)?(?:/\d+(?:\.\d+)?)?\s*(?:MG|MCG|MG/ML|UNITS?|%|MEQ))", name, re.IGNORECASE)
-    return match.group(1) if match else ""
-
-
-def _extract_form(name: str) -> str:
-    """Extract dosage form from RxNorm drug name."""
-    name_upper = name.upper()
-    for pattern, form in FORM_PATTERNS.items():
-        if pattern.upper() in name_upper:
-            return form
-    return ""
+        if group.get("tty", "") in ("SCD", "SBD")
+        for concept in group.get("conceptProperties") or ()
+    ]
+
+
+def _to_medication(concept: dict) -> dict:
+    """Convert one RxNorm concept into the frontend medication format."""
+    name = concept.get("name", "")
+    strength, form = _extract_strength_and_form(name)
+    return {
+        "id": concept.get("rxcui", ""),
+        "name": name,
+        "strength": strength,
+        "form": form,
+        "commonDosing": get_common_dosing(name),
+        "isControlled": False,
+    }
+
+
+def _extract_strength_and_form(name: str) -> tuple[str, str]:
+    """Extract strength and dosage form from an RxNorm drug name.
+
+    e.g. ('500 MG', 'tablet') from 'Amoxicillin 500 MG Oral Tablet'. Each is
+    the first occurrence in the name, or '' if there is none.
+    """
+    strength = form = ""
+    for match in _NAME_RE.finditer(name):
+        if match.lastgroup == "strength":
+            if not strength:
+                strength = match.group("strength")
+        elif not form:
+            # IGNORECASE also lets "İ" match "I", which upper() leaves alone
+            form = _FORM_BY_PATTERN.get(match.group("form").upper(), "")
+        if strength and form:
+            break
+    return strength, form
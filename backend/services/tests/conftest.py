@@ -1,4 +1,5 @@
 import pytest
+import pytest_asyncio
 import sys
 from pathlib import Path
 
@@ -13,42 +14,48 @@ parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir))
 
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 
 from main import app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
     """
     FastAPI test client for making requests to your endpoints.
     This is synchronous and perfect for simple API testing.
+    Entered as a context manager so the app lifespan opens the RxNorm client,
+    once for the whole session rather than per test.
     """
-    return TestClient(app)
-
-
-@pytest.fixture
-def sample_patient():
-    """Reusable sample patient data for tests"""
-    return {
-        "id": 1,
-        "first_name": "John",
-        "last_name": "Doe",
-        "date_of_birth": "1980-05-15",
-        "mrn": "MRN-001234"
-    }
-
-
-@pytest.fixture
-def sample_medication():
-    """Reusable sample medication data for tests"""
-    return {
-        "rxcui": "197361",
-        "name": "Simvastatin 20 MG Oral Tablet",
-        "generic_name": "simvastatin"
-    }
-
-
-@pytest.fixture
-def sample_search_term():
-    """Common medication search term"""
-    return "simvastatin"
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def get_json(client):
+    """
+    GET a path with the shared client and return (status_code, parsed body).
+    The body is parsed once, since Response.json() re-parses on every call.
+    """
+    def _get_json(url, **kwargs):
+        response = client.get(url, **kwargs)
+        return response.status_code, response.json()
+    return _get_json
+
+
+@pytest_asyncio.fixture
+async def async_client():
+    """
+    Async client on the in-process app, for tests that issue requests concurrently.
+    Runs the app lifespan itself since ASGITransport does not.
+    """
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            yield ac
+
+
+@pytest.fixture(scope="module")
+def first_patient_id(client):
+    """ID of the first patient from GET /patients, fetched once per module"""
+    return client.get("/patients").json()[0]["id"]
+
@@ -6,147 +6,95 @@ Tests the common dosing pattern lookup functionality.
 
 import pytest
 
-from dosing_data import get_common_dosing, _extract_strength_value, _find_matching_drug
+from dosing_data import get_common_dosing, get_default_duration, _extract_strength_value, _find_matching_drug
+
+# Computed once at import; every casing of the name should match it
+AMOXICILLIN_500_REFERENCE = get_common_dosing("Amoxicillin 500 MG")
 
 
 @pytest.mark.unit
 class TestGetCommonDosing:
     """Tests for get_common_dosing function"""
 
-    def test_amoxicillin_500mg_returns_dosing(self):
-        """Should return common dosing for Amoxicillin 500mg"""
-        result = get_common_dosing("Amoxicillin 500 MG Oral Capsule")
-        assert result == ["500mg TID", "500mg BID"]
-
-    def test_amoxicillin_250mg_returns_dosing(self):
-        """Should return strength-specific dosing for 250mg"""
-        result = get_common_dosing("Amoxicillin 250 MG Oral Capsule")
-        assert result == ["250mg TID", "250mg BID"]
-
-    def test_amoxicillin_875mg_returns_dosing(self):
-        """Should return correct dosing for 875mg strength"""
-        result = get_common_dosing("Amoxicillin 875 MG Oral Tablet")
-        assert result == ["875mg BID"]
-
-    def test_lisinopril_returns_dosing(self):
-        """Should return common dosing for Lisinopril"""
-        result = get_common_dosing("Lisinopril 10 MG Oral Tablet")
-        assert result == ["10mg daily"]
-
-    def test_atorvastatin_returns_bedtime_dosing(self):
-        """Should return at bedtime dosing for statins"""
-        result = get_common_dosing("Atorvastatin 20 MG Oral Tablet")
-        assert result == ["20mg daily at bedtime"]
-
-    def test_albuterol_inhaler_returns_prn(self):
-        """Should return PRN dosing for inhalers"""
-        result = get_common_dosing("Albuterol 90 MCG Metered Dose Inhaler")
-        assert result == ["2 puffs every 4-6 hours PRN"]
-
-    def test_unknown_medication_returns_empty(self):
-        """Should return empty list for unknown medications"""
-        result = get_common_dosing("Unknown Medication 123 MG Tablet")
-        assert result == []
-
-    def test_case_insensitive_matching(self):
+    @pytest.mark.parametrize("medication_name, expected", [
+        pytest.param("Amoxicillin 500 MG Oral Capsule", ["500mg TID", "500mg BID"], id="amoxicillin_500mg"),
+        pytest.param("Amoxicillin 250 MG Oral Capsule", ["250mg TID", "250mg BID"], id="amoxicillin_250mg"),
+        pytest.param("Amoxicillin 875 MG Oral Tablet", ["875mg BID"], id="amoxicillin_875mg"),
+        pytest.param("Lisinopril 10 MG Oral Tablet", ["10mg daily"], id="lisinopril"),
+        pytest.param("Atorvastatin 20 MG Oral Tablet", ["20mg daily at bedtime"], id="statin_at_bedtime"),
+        pytest.param("Albuterol 90 MCG Metered Dose Inhaler", ["2 puffs every 4-6 hours PRN"], id="inhaler_prn"),
+        pytest.param("Unknown Medication 123 MG Tablet", [], id="unknown_medication"),
+        pytest.param("Gabapentin 300 MG Oral Capsule", ["300mg TID"], id="gabapentin_tid"),
+        pytest.param(
+            "Hydrocodone Bitartrate 5 MG / Acetaminophen 325 MG Oral Tablet",
+            ["1-2 tablets every 4-6 hours PRN"],
+            id="opioid_prn",
+        ),
+        pytest.param("Azithromycin 250 MG Oral Tablet", ["500mg day 1, then 250mg days 2-5"], id="azithromycin_zpack"),
+        # 15mg is not in database, should use default
+        pytest.param("Lisinopril 15 MG Oral Tablet", ["10mg daily"], id="unknown_strength_uses_default"),
+        pytest.param("Omeprazole 20 MG Oral Capsule", ["20mg daily before breakfast"], id="ppi_before_breakfast"),
+    ])
+    def test_common_dosing(self, medication_name, expected):
+        """Should return the common dosing patterns for the medication"""
+        assert get_common_dosing(medication_name) == expected
+
+    @pytest.mark.parametrize("medication_name", ["AMOXICILLIN 500 MG", "amoxicillin 500 mg", "aMoXiCiLlIn 500 Mg"])
+    def test_case_insensitive_matching(self, medication_name):
         """Should match medication names case-insensitively"""
-        result1 = get_common_dosing("AMOXICILLIN 500 MG")
-        result2 = get_common_dosing("amoxicillin 500 mg")
-        result3 = get_common_dosing("Amoxicillin 500 MG")
+        assert len(AMOXICILLIN_500_REFERENCE) > 0
+        assert get_common_dosing(medication_name) == AMOXICILLIN_500_REFERENCE
+
+    def test_returns_independent_lists(self):
+        """Mutating a result should not affect later calls or COMMON_DOSING_PATTERNS"""
+        first = get_common_dosing("Lisinopril 10 MG Oral Tablet")
+        first.append("corrupted")
+        empty = get_common_dosing("Unknown Medication")
+        empty.append("corrupted")
 
-        assert result1 == result2 == result3
-        assert len(result1) > 0
+        assert get_common_dosing("Lisinopril 10 MG Oral Tablet") == ["10mg daily"]
+        assert get_common_dosing("Unknown Medication") == []
 
     def test_metformin_500_returns_bid(self):
         """Should return BID dosing for Metformin 500"""
         result = get_common_dosing("Metformin 500 MG Oral Tablet")
         assert "500mg BID" in result
 
-    def test_gabapentin_returns_tid(self):
-        """Should return TID dosing for Gabapentin"""
-        result = get_common_dosing("Gabapentin 300 MG Oral Capsule")
-        assert result == ["300mg TID"]
-
-    def test_opioid_returns_prn_dosing(self):
-        """Should return PRN dosing for controlled substances"""
-        result = get_common_dosing("Hydrocodone Bitartrate 5 MG / Acetaminophen 325 MG Oral Tablet")
-        assert result == ["1-2 tablets every 4-6 hours PRN"]
-
-    def test_azithromycin_returns_zpack_dosing(self):
-        """Should return Z-pack dosing for azithromycin"""
-        result = get_common_dosing("Azithromycin 250 MG Oral Tablet")
-        assert result == ["500mg day 1, then 250mg days 2-5"]
-
     def test_prednisone_includes_taper(self):
         """Should include taper instructions for prednisone"""
         result = get_common_dosing("Prednisone 10 MG Oral Tablet")
         assert "Taper per instructions" in result
 
-    def test_fallback_to_default_for_unknown_strength(self):
-        """Should use default dosing when strength not in database"""
-        result = get_common_dosing("Lisinopril 15 MG Oral Tablet")
-        # 15mg is not in database, should use default
-        assert result == ["10mg daily"]
-
-    def test_omeprazole_before_breakfast(self):
-        """Should return before breakfast instruction for PPIs"""
-        result = get_common_dosing("Omeprazole 20 MG Oral Capsule")
-        assert result == ["20mg daily before breakfast"]
-
 
 @pytest.mark.unit
 class TestExtractStrengthValue:
     """Tests for _extract_strength_value helper function"""
 
-    def test_extracts_integer_mg(self):
-        """Should extract integer mg strength"""
-        result = _extract_strength_value("Amoxicillin 500 MG Oral Capsule")
-        assert result == "500"
-
-    def test_extracts_decimal_mg(self):
-        """Should extract decimal mg strength"""
-        result = _extract_strength_value("Levothyroxine 0.05 MG Oral Tablet")
-        assert result == "0.05"
-
-    def test_extracts_mcg(self):
-        """Should extract mcg strength"""
-        result = _extract_strength_value("Albuterol 90 MCG Inhaler")
-        assert result == "90"
-
-    def test_returns_none_for_no_strength(self):
-        """Should return None when no strength found"""
-        result = _extract_strength_value("Some Medication Without Strength")
-        assert result is None
+    @pytest.mark.parametrize("medication_name, expected", [
+        pytest.param("Amoxicillin 500 MG Oral Capsule", "500", id="integer_mg"),
+        pytest.param("Levothyroxine 0.05 MG Oral Tablet", "0.05", id="decimal_mg"),
+        pytest.param("Albuterol 90 MCG Inhaler", "90", id="mcg"),
+        pytest.param("Some Medication Without Strength", None, id="no_strength"),
+    ])
+    def test_extract_strength_value(self, medication_name, expected):
+        """Should extract the numeric strength, or None when there is none"""
+        assert _extract_strength_value(medication_name) == expected
 
 
 @pytest.mark.unit
 class TestFindMatchingDrug:
     """Tests for _find_matching_drug helper function"""
 
-    def test_finds_amoxicillin(self):
-        """Should find amoxicillin in drug name"""
-        result = _find_matching_drug("Amoxicillin 500 MG Oral Capsule")
-        assert result == "amoxicillin"
-
-    def test_finds_drug_case_insensitive(self):
-        """Should find drug regardless of case"""
-        result = _find_matching_drug("LISINOPRIL 10 MG ORAL TABLET")
-        assert result == "lisinopril"
-
-    def test_returns_none_for_unknown(self):
-        """Should return None for unknown drugs"""
-        result = _find_matching_drug("Unknown Drug 123 MG")
-        assert result is None
-
-    def test_finds_combination_drug(self):
-        """Should find combination drugs"""
-        result = _find_matching_drug("Hydrocodone Bitartrate 5 MG / Acetaminophen 325 MG")
-        assert result == "hydrocodone"
-
-    def test_finds_partial_name(self):
-        """Should find drug with partial name match"""
-        result = _find_matching_drug("Metformin Extended Release 500 MG")
-        assert result == "metformin"
+    @pytest.mark.parametrize("medication_name, expected", [
+        pytest.param("Amoxicillin 500 MG Oral Capsule", "amoxicillin", id="amoxicillin"),
+        pytest.param("LISINOPRIL 10 MG ORAL TABLET", "lisinopril", id="case_insensitive"),
+        pytest.param("Unknown Drug 123 MG", None, id="unknown"),
+        pytest.param("Hydrocodone Bitartrate 5 MG / Acetaminophen 325 MG", "hydrocodone", id="combination_drug"),
+        pytest.param("Metformin Extended Release 500 MG", "metformin", id="partial_name"),
+    ])
+    def test_find_matching_drug(self, medication_name, expected):
+        """Should find the known drug named in the medication, or None"""
+        assert _find_matching_drug(medication_name) == expected
 
 @pytest.mark.unit
 class TestGetCommonDosingEdgeCases:
@@ -289,4 +237,30 @@ class TestDefaultDosingPatterns:
         assert result == ["500/125mg BID"]
 
 
+@pytest.mark.unit
+class TestGetDefaultDuration:
+    """Tests for get_default_duration function"""
+
+    def test_antibiotic_returns_10_days(self):
+        """Should return 10 days for antibiotics"""
+        assert get_default_duration("Amoxicillin 500 MG Oral Capsule") == 10
+
+    def test_combination_antibiotic_returns_10_days(self):
+        """Should return 10 days for combination antibiotics"""
+        assert get_default_duration("Amoxicillin-Clavulanate 875/125 MG") == 10
+
+    def test_steroid_returns_7_days(self):
+        """Should return 7 days for short-term steroids"""
+        assert get_default_duration("Prednisone 10 MG Oral Tablet") == 7
+
+    def test_prn_returns_30_days(self):
+        """Should return 30 days for PRN medications"""
+        assert get_default_duration("Ibuprofen 400 MG Oral Tablet") == 30
+
+    def test_chronic_returns_30_days(self):
+        """Should return 30 days for chronic medications"""
+        assert get_default_duration("Lisinopril 10 MG Oral Tablet") == 30
 
+    def test_unknown_returns_30_days(self):
+        """Should fall back to 30 days for unknown medications"""
+        assert get_default_duration("Unknown Medication") == 30
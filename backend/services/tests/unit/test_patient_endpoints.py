@@ -5,6 +5,8 @@ These tests verify the API contract and response structure
 without needing a real database.
 """
 
+import asyncio
+
 import pytest
 from fastapi import status
 
@@ -18,18 +20,16 @@ class TestGetPatients:
         response = client.get("/patients")
         assert response.status_code == status.HTTP_200_OK
     
-    def test_get_patients_returns_list(self, client):
+    def test_get_patients_returns_list(self, get_json):
         """Should return a list of patients"""
-        response = client.get("/patients")
-        data = response.json()
+        _, data = get_json("/patients")
         
         assert isinstance(data, list)
         assert len(data) > 0
     
-    def test_get_patients_structure(self, client):
+    def test_get_patients_structure(self, get_json):
         """Each patient should have required fields"""
-        response = client.get("/patients")
-        patients = response.json()
+        _, patients = get_json("/patients")
         
         # Check first patient has expected structure
         first_patient = patients[0]
@@ -38,32 +38,62 @@ class TestGetPatients:
         assert "dateOfBirth" in first_patient
         assert "mrn" in first_patient
     
-    def test_get_patients_data_types(self, client):
+    def test_get_patients_data_types(self, get_json):
         """Patient fields should have correct types"""
-        response = client.get("/patients")
-        first_patient = response.json()[0]
+        _, patients = get_json("/patients")
+        first_patient = patients[0]
         
         assert isinstance(first_patient["id"], str)
         assert isinstance(first_patient["name"], str)
         assert isinstance(first_patient["dateOfBirth"], str)
         assert isinstance(first_patient["mrn"], str)
     
-    def test_get_patients_consistent_data(self, client):
+    def test_get_patients_consistent_data(self, get_json):
         """Multiple calls should return same data (since using fake data)"""
-        response1 = client.get("/patients")
-        response2 = client.get("/patients")
-        
-        assert response1.json() == response2.json()
+        assert get_json("/patients") == get_json("/patients")
+
+    def test_get_patients_sets_etag(self, client):
+        """Should send an ETag and a private Cache-Control header"""
+        response = client.get("/patients")
+
+        assert response.headers["etag"].startswith('W/"')
+        assert response.headers["cache-control"] == "private, max-age=60"
+
+    def test_get_patients_not_modified(self, client):
+        """Should return an empty 304 when If-None-Match matches the ETag"""
+        etag = client.get("/patients").headers["etag"]
+        response = client.get("/patients", headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    @pytest.mark.parametrize("if_none_match", [
+        pytest.param("{opaque}", id="strong_form"),
+        pytest.param('"stale", {etag}', id="list"),
+        pytest.param("*", id="any"),
+    ])
+    def test_get_patients_not_modified_forms(self, client, if_none_match):
+        """Should compare If-None-Match weakly, as a list that may be *"""
+        etag = client.get("/patients").headers["etag"]
+        header = if_none_match.format(etag=etag, opaque=etag.removeprefix("W/"))
+        response = client.get("/patients", headers={"If-None-Match": header})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_get_patients_stale_etag(self, client):
+        """Should return the full body when If-None-Match does not match"""
+        response = client.get("/patients", headers={"If-None-Match": '"stale"'})
+        assert response.status_code == status.HTTP_200_OK
 
 
 @pytest.mark.unit
 class TestGetPatientById:
     """Tests for GET /patients/{patient_id} endpoint"""
     
-    def test_get_patient_by_id_returns_200(self, client):
+    def test_get_patient_by_id_returns_200(self, client, first_patient_id):
         """Should return 200 for existing patient"""
-        patients = client.get("/patients").json()
-        response = client.get(f"/patients/{patients[0]['id']}")
+        response = client.get(f"/patients/{first_patient_id}")
         assert response.status_code == status.HTTP_200_OK
     
     def test_get_patient_by_id_not_found(self, client):
@@ -72,46 +102,13 @@ class TestGetPatientById:
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
-@pytest.mark.unit
-class TestCreatePatient:
-    """Tests for POST /patients endpoint (not implemented yet)"""
-    
-    @pytest.mark.skip(reason="Endpoint not implemented yet")
-    def test_create_patient_success(self, client, sample_patient):
-        """Should create patient and return 201"""
-        response = client.post("/patients", json=sample_patient)
-        assert response.status_code == status.HTTP_201_CREATED
-    
-    @pytest.mark.skip(reason="Endpoint not implemented yet")
-    def test_create_patient_missing_required_field(self, client):
-        """Should return 422 when required field is missing"""
-        incomplete_data = {
-            "first_name": "John"
-            # Missing last_name, dob, etc.
-        }
-        response = client.post("/patients", json=incomplete_data)
-        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
-    
-    @pytest.mark.skip(reason="Endpoint not implemented yet")
-    def test_create_patient_invalid_date_format(self, client):
-        """Should return 422 for invalid date format"""
-        invalid_data = {
-            "first_name": "John",
-            "last_name": "Doe",
-            "date_of_birth": "not-a-date",
-            "mrn": "MRN-001"
-        }
-        response = client.post("/patients", json=invalid_data)
-        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
-
 @pytest.mark.unit
 class TestGetPatientAllergies:
     """Tests for GET /patients/{patient_id}/allergies endpoint"""
     
-    def test_get_patient_allergies_returns_200(self, client):
+    def test_get_patient_allergies_returns_200(self, client, first_patient_id):
         """Should return 200 for existing patient"""
-        patients = client.get("/patients").json()
-        response = client.get(f"/patients/{patients[0]['id']}/allergies")
+        response = client.get(f"/patients/{first_patient_id}/allergies")
         assert response.status_code == status.HTTP_200_OK
     
     def test_get_patient_allergies_not_found(self, client):
@@ -124,10 +121,9 @@ class TestGetPatientAllergies:
 class TestGetPatientMedications:
     """Tests for GET /patients/{patient_id}/medications endpoint"""
     
-    def test_get_patient_medications_returns_200(self, client):
+    def test_get_patient_medications_returns_200(self, client, first_patient_id):
         """Should return 200 for existing patient"""
-        patients = client.get("/patients").json()
-        response = client.get(f"/patients/{patients[0]['id']}/medications")
+        response = client.get(f"/patients/{first_patient_id}/medications")
         assert response.status_code == status.HTTP_200_OK
     
     def test_get_patient_medications_not_found(self, client):
@@ -136,4 +132,28 @@ class TestGetPatientMedications:
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestPatientEndpointsConcurrent:
+    """Tests issuing requests for every patient at once"""
+
+    async def test_every_patient_resource_returns_200(self, async_client):
+        """Should serve each patient's record, allergies and medications concurrently"""
+        patients = (await async_client.get("/patients")).json()
+        urls = [
+            f"/patients/{patient['id']}{suffix}"
+            for patient in patients
+            for suffix in ("", "/allergies", "/medications")
+        ]
+        responses = await asyncio.gather(*(async_client.get(url) for url in urls))
+
+        assert [r.status_code for r in responses] == [status.HTTP_200_OK] * len(urls)
+
+    async def test_unknown_patient_resources_return_404(self, async_client):
+        """Should return 404 for every resource of a non-existent patient"""
+        responses = await asyncio.gather(*(
+            async_client.get(f"/patients/99999{suffix}")
+            for suffix in ("", "/allergies", "/medications")
+        ))
 
+        assert [r.status_code for r in responses] == [status.HTTP_404_NOT_FOUND] * 3
@@ -0,0 +1,150 @@
+"""
+Unit tests for the rxnorm module.
+
+RxNorm HTTP calls are mocked with respx, so these run without network access.
+"""
+
+import httpx
+from httpx import Response
+import pytest
+import pytest_asyncio
+import respx
+
+import rxnorm
+from rxnorm import RXNORM_BASE_URL, rxnorm_client, search_medications, _extract_strength_and_form
+
+DRUGS_RESPONSE = {
+    "drugGroup": {
+        "name": None,
+        "conceptGroup": [
+            {"tty": "BN", "conceptProperties": [{"rxcui": "723", "name": "Amoxil"}]},
+            {
+                "tty": "SCD",
+                "conceptProperties": [
+                    {"rxcui": "308182", "name": "amoxicillin 500 MG Oral Capsule"},
+                    {"rxcui": "308191", "name": "amoxicillin 875 MG Oral Tablet"},
+                ],
+            },
+            {
+                "tty": "SBD",
+                "conceptProperties": [
+                    {"rxcui": "1043400", "name": "Amoxicillin 250 MG/5ML Oral Suspension [Amoxil]"},
+                ],
+            },
+            {"tty": "SCD"},
+        ],
+    }
+}
+
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def mock_rxnorm():
+    """Mock the RxNorm getDrugs endpoint and open the shared client (with an empty cache)"""
+    with respx.mock:
+        route = respx.get(f"{RXNORM_BASE_URL}/drugs.json").mock(
+            return_value=Response(200, json=DRUGS_RESPONSE)
+        )
+        async with rxnorm_client():
+            yield route
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio(loop_scope="module")
+class TestSearchMedications:
+    """Tests for search_medications function"""
+
+    async def test_parses_clinical_and_branded_drugs(self, mock_rxnorm):
+        """Should return SCD and SBD concepts only, in frontend format"""
+        result = await search_medications("amoxicillin")
+
+        assert result == [
+            {
+                "id": "308182",
+                "name": "amoxicillin 500 MG Oral Capsule",
+                "strength": "500 MG",
+                "form": "capsule",
+                "commonDosing": ["500mg TID", "500mg BID"],
+                "isControlled": False,
+            },
+            {
+                "id": "308191",
+                "name": "amoxicillin 875 MG Oral Tablet",
+                "strength": "875 MG",
+                "form": "tablet",
+                "commonDosing": ["875mg BID"],
+                "isControlled": False,
+            },
+            {
+                "id": "1043400",
+                "name": "Amoxicillin 250 MG/5ML Oral Suspension [Amoxil]",
+                "strength": "250 MG",
+                "form": "liquid",
+                "commonDosing": ["250mg TID", "250mg BID"],
+                "isControlled": False,
+            },
+        ]
+
+    async def test_sends_query_as_name_param(self, mock_rxnorm):
+        """Should pass the normalized query to RxNorm"""
+        await search_medications("  Amoxicillin ")
+
+        assert mock_rxnorm.calls.last.request.url.params["name"] == "amoxicillin"
+
+    async def test_empty_drug_group(self, mock_rxnorm):
+        """Should return empty list when RxNorm has no matches"""
+        mock_rxnorm.mock(return_value=Response(200, json={"drugGroup": {"name": None}}))
+        assert await search_medications("nonexistent") == []
+
+    async def test_repeat_queries_are_cached(self, mock_rxnorm):
+        """Should only call RxNorm once for queries that normalize the same"""
+        first = await search_medications("amoxicillin")
+        second = await search_medications(" AMOXICILLIN ")
+
+        assert first == second
+        assert mock_rxnorm.call_count == 1
+
+    async def test_returns_independent_results(self, mock_rxnorm):
+        """Mutating a result should not affect later calls served from the cache"""
+        first = await search_medications("amoxicillin")
+        first[0]["commonDosing"].append("corrupted")
+        first[0]["name"] = "corrupted"
+        first.clear()
+
+        second = await search_medications("amoxicillin")
+        assert second[0]["name"] == "amoxicillin 500 MG Oral Capsule"
+        assert second[0]["commonDosing"] == ["500mg TID", "500mg BID"]
+        assert mock_rxnorm.call_count == 1
+
+    async def test_errors_are_not_cached(self, mock_rxnorm):
+        """Should retry RxNorm after a failed request"""
+        mock_rxnorm.mock(return_value=Response(503))
+        with pytest.raises(httpx.HTTPStatusError):
+            await search_medications("amoxicillin")
+
+        mock_rxnorm.mock(return_value=Response(200, json=DRUGS_RESPONSE))
+        assert len(await search_medications("amoxicillin")) == 3
+        assert mock_rxnorm.call_count == 2
+
+    async def test_requires_open_client(self, monkeypatch):
+        """Should raise a clear error when called outside rxnorm_client()"""
+        # The session TestClient may have the app lifespan's client open
+        monkeypatch.setattr(rxnorm, "_cached_search", None)
+        with pytest.raises(RuntimeError, match="rxnorm_client"):
+            await search_medications("amoxicillin")
+
+
+@pytest.mark.unit
+class TestExtractStrengthAndForm:
+    """Tests for _extract_strength_and_form helper function"""
+
+    @pytest.mark.parametrize("name, expected", [
+        pytest.param("Amoxicillin 500 MG Oral Tablet", ("500 MG", "tablet"), id="strength_and_form"),
+        pytest.param("insulin 100 units/ml Injectable Solution", ("100 units", "injection"), id="keeps_source_casing"),
+        pytest.param("Unknown Drug", ("", ""), id="neither"),
+        # str.upper() lengthens these names, which must not shift the strength
+        pytest.param("Straße 0.5 % Cream", ("0.5 %", ""), id="sharp_s"),
+        pytest.param("\ufb01brin 5 MG/ML Topical Cream", ("5 MG", "topical"), id="fi_ligature"),
+    ])
+    def test_extract_strength_and_form(self, name, expected):
+        """Should return the first strength exactly as written and the dosage form"""
+        assert _extract_strength_and_form(name) == expected